@@ -1,16 +1,260 @@
+import asyncio
+import collections
 import datetime
+import functools
+import gzip
+import hashlib
+import importlib.util
 import io
-import json
 import logging
 import os
+import random
+import re
+import sqlite3
 import sys
 import tarfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 
-import arxiv
-import openai
+import lxml.html
+import orjson
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from pydantic import BaseModel, field_validator
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _lazy_import(name: str):
+    """
+    Returns the named module without executing it; the real import runs on first attribute
+    access. The openai SDK alone takes most of a second to import, which --help, webhook-only
+    use and fully cached runs never need. A module that is already imported is returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(
+            f"No module named '{name}'. Install the requirements with: pip install -r requirements.txt",
+            name=name,
+        )
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+openai = _lazy_import("openai")
+
+# (connect, read) timeouts in seconds for every HTTP request, so a stalled connection fails
+# (and is retried by the session's Retry) instead of holding a worker thread indefinitely
+HTTP_TIMEOUT = (5, 30)
+# Seconds before a request to the OpenAI API is abandoned (and retried); the SDK default is 600
+OPENAI_TIMEOUT = 120.0
+
+WEBHOOK_HEADERS = {"Content-Type": "application/json"}
+WEBHOOK_GZIP_HEADERS = {**WEBHOOK_HEADERS, "Content-Encoding": "gzip"}
+
+# Abstracts sent for summarization are cut to this many characters. The lede carries what a
+# 3-sentence summary needs, and only the few longest abstracts (arXiv allows 1920) are cut.
+MAX_ABSTRACT_CHARS = 1500
+
+# Invariant instructions are sent as system messages, so every request in a run starts with a
+# byte-identical prefix that providers can reuse (prompt caching) and only the paper varies.
+RELEVANCE_SCALE = """0 for Low relevance to all of the user's interests,
+1 for Medium relevance to any of the user's interests,
+2 for High relevance to any of the user's interests."""
+
+SUMMARY_FIELDS = """- "translated_title": the title of the paper translated to {language}.
+- "summary": the most important information of the paper in up to 3 sentences, in {language}."""
+
+SUMMARY_PREFIX = f"""Read the research paper given by the user and respond with a JSON object containing these fields:
+{SUMMARY_FIELDS}"""
+
+PACKED_SUMMARY_PREFIX = f"""Read the numbered research papers given by the user and respond with a JSON object with a single field "papers": a list holding, in the given order, one object per paper with these fields:
+- "index": the number of the paper.
+{SUMMARY_FIELDS}"""
+
+SUMMARY_RELEVANCE_FIELD = f"""
+- "relevance": a single integer rating the relevance of the paper to the user's (list of) area of interest:
+{RELEVANCE_SCALE}"""
+
+AFFILIATION_PREFIX = """The user provides lines extracted from a .tex file.
+Your task is to identify and extract the author affiliations.
+Output Format:
+- Only extract the top-level affiliation (e.g., University name, Company name, Research Institute name), avoiding overly specific details like departments, schools, or specific addresses.
+- If there are affiliations, list them without numbering, separated by semicolons (;).
+- If the number of unique top-level affiliations is more than three, list the first three, followed by "etc." to indicate the rest.
+- Respond in {language}.
+- If no affiliations are found, respond with 'None'.
+- **Do not respond with anything other than the affiliations!**
+Examples of desired output (assuming English, do not include the double quotes):
+- "University of Example; Tech Innovations Inc."
+- "University A; Company B; Research Institute C; etc."
+- "None"
+Examples of what to avoid (too detailed):
+- "Department of Physics, University of Example" -> should be "University of Example"
+- "AI Lab, Company C, Country P" -> should be "Company C"
+- "School of Computer Science, University Z, City X" -> should be "University Z"
+"""
+
+RELEVANCE_PREFIX = f"""Given a research paper's title and abstract, and a (list of) user's area of interest, rate the relevance of the paper to the user's interest.
+Respond with only a single integer:
+{RELEVANCE_SCALE}"""
+
+
+def retry_on_transient_error(max_attempts: int = 3):
+    """
+    Decorator for async OpenAI calls that retries on RateLimitError, InternalServerError (5xx)
+    and APIConnectionError (dropped connections, server disconnects, timeouts) once the client's
+    own retries are exhausted. It sleeps for the server's Retry-After when present, otherwise for an
+    exponential backoff with jitter capped at 60 seconds.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except (
+                    openai.RateLimitError,
+                    openai.InternalServerError,
+                    openai.APIConnectionError,
+                ) as e:
+                    if attempt == max_attempts:
+                        raise
+                    retry_after = None
+                    if isinstance(e, openai.APIStatusError):
+                        retry_after = e.response.headers.get("retry-after")
+                    try:
+                        delay = float(retry_after)
+                    except (TypeError, ValueError):
+                        delay = min(60, 2**attempt + random.random())
+                    logging.warning(
+                        "%s from OpenAI API (attempt %s/%s). Retrying in %.1fs.",
+                        type(e).__name__,
+                        attempt,
+                        max_attempts,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimitedRetry(Retry):
+    """
+    Retry that, after its usual backoff, also waits for a slot of a shared rate limit. urllib3
+    retries inside HTTPAdapter.send, so without this the retries would bypass the limit.
+    """
+
+    def __init__(self, *args, wait_for_slot=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_for_slot = wait_for_slot
+
+    def new(self, **kwargs):
+        # urllib3 builds a new Retry for every attempt; carry the limiter over
+        retry = super().new(**kwargs)
+        retry.wait_for_slot = self.wait_for_slot
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.wait_for_slot is not None:
+            self.wait_for_slot()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that spaces out the requests it sends by at least min_interval seconds, shared
+    by every thread using it. arXiv asks clients to make no more than one request every three
+    seconds, and the listing, the bulk metadata queries and the TeX downloads all go to its
+    hosts from the worker threads at the same time. Retries take a slot too, when max_retries
+    is a RateLimitedRetry.
+    """
+
+    def __init__(self, min_interval: float, **kwargs):
+        super().__init__(**kwargs)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        if isinstance(self.max_retries, RateLimitedRetry):
+            self.max_retries.wait_for_slot = self.wait_for_slot
+
+    def wait_for_slot(self):
+        """Blocks until the next free slot; slots are reserved under the lock, slept outside it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def send(self, request, **kwargs):
+        self.wait_for_slot()
+        return super().send(request, **kwargs)
+
+
+class PaperSummary(BaseModel):
+    """Schema of the JSON object returned by the combined summarize/score request."""
+
+    translated_title: str
+    summary: str
+    relevance: int = 0
+
+    @field_validator("relevance", mode="before")
+    @classmethod
+    def _default_unexpected_relevance(cls, value):
+        """Falls back to 0 (low) when the LLM returns anything other than 0, 1 or 2."""
+        if value not in (0, 1, 2, "0", "1", "2"):
+            logging.warning(
+                "LLM returned an unexpected relevance score: '%s'. Defaulting to 0.", value
+            )
+            return 0
+        return value
+
+
+class PackedPaperSummary(PaperSummary):
+    """One paper's entry in the response to a packed (several papers) summarize/score request."""
+
+    index: int
+
+
+class PackedSummaries(BaseModel):
+    """Schema of the JSON object returned by a packed summarize/score request."""
+
+    papers: list[PackedPaperSummary]
+
+
+# Minimum relevance score per --filter_level; -1 means no filtering
+RELEVANCE_THRESHOLDS = {"low": 0, "mid": 1, "high": 2, "none": -1}
+
+
+class PipelineRun:
+    """Per-run settings and state shared by the paper processing steps of ArxivSummarizer."""
+
+    def __init__(
+        self,
+        user_interest: str | None,
+        filter_level: str,
+        prefetched: dict[str, dict],
+        on_paper: Callable[[dict], Awaitable[None]] | None,
+        max_concurrent_requests: int,
+    ):
+        self.user_interest = user_interest
+        self.filter_level = filter_level
+        self.min_relevance_score = RELEVANCE_THRESHOLDS.get(filter_level.lower(), -1)
+        self.prefetched = prefetched  # Bulk-fetched metadata by paper ID
+        self.on_paper = on_paper
+        self.sem = asyncio.Semaphore(max_concurrent_requests)
 
 
 class ArxivSummarizer:
@@ -21,53 +265,260 @@ class ArxivSummarizer:
     def __init__(self):
         """
         Initializes the ArxivSummarizer class.
-        Loads environment variables, sets up logging, and initializes the OpenAI client.
+        Loads environment variables, sets up logging, and initializes the HTTP client.
         """
+        load_dotenv()  # Load .env if it exists, before LOG_LEVEL and the settings are read
         self._setup_logging()  # Initialize logging
         self._load_environment_variables()
-        self.client = openai.OpenAI(
+        self.summary_prompt = SUMMARY_PREFIX.format(language=self.summary_language)
+        self.packed_summary_prompt = PACKED_SUMMARY_PREFIX.format(language=self.summary_language)
+        self.affiliation_prompt = AFFILIATION_PREFIX.format(language=self.summary_language)
+        # Shared HTTP session so repeated arXiv / webhook requests reuse keep-alive connections
+        self.http = requests.Session()
+        self.http.headers.update(
+            {"User-Agent": "arxiv-summary/1.0 (+https://github.com/makaichi/arxiv-summary)"}
+        )
+        # Back off and retry transient failures (honoring Retry-After) instead of dropping work.
+        # The schedule (an immediate retry, then 3s, 6s, 12s, 24s, each plus up to 1s of jitter)
+        # rides out arXiv's flaky periods without the concurrent workers retrying in lockstep.
+        retry_settings = dict(
+            total=5,
+            backoff_factor=1.5,
+            backoff_jitter=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+        )
+        # Other hosts (i.e. the webhook) retry POSTs too, but only on 429/503 and connection
+        # failures, where the message is known not to have been delivered. A read error after
+        # sending is not retried, since the message may have gone out already. The last
+        # response is returned rather than raised, so its status is logged.
+        webhook_retries = Retry(
+            **{**retry_settings, "status_forcelist": [429, 503]},
+            read=0,
+            other=0,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_maxsize=self.max_concurrent_requests, max_retries=webhook_retries
+        )
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        # Requests to arXiv, retries included, additionally share one rate limit across all
+        # worker threads
+        arxiv_adapter = RateLimitedAdapter(
+            self.arxiv_request_interval,
+            pool_maxsize=self.max_concurrent_requests,
+            max_retries=RateLimitedRetry(**retry_settings),
+        )
+        self.http.mount("https://export.arxiv.org/", arxiv_adapter)
+        self.http.mount("https://arxiv.org/", arxiv_adapter)
+        self._setup_cache()
+        # In-memory LRU of deterministic completions: request JSON -> response content
+        self._completions = collections.OrderedDict()
+
+    @functools.cached_property
+    def client(self) -> "openai.AsyncOpenAI":
+        """The OpenAI client, created (and the SDK imported) on first use."""
+        return openai.AsyncOpenAI(
             api_key=self.openai_api_key,
             base_url=self.openai_base_url,
             max_retries=5,  # Enable retries
+            timeout=OPENAI_TIMEOUT,
         )
 
     def _setup_logging(self):
-        """Configures logging."""
+        """Configures logging. The level comes from LOG_LEVEL (default: INFO)."""
         logging.basicConfig(
-            level=logging.INFO,
+            level=os.getenv("LOG_LEVEL", "INFO").upper(),
             format="%(asctime)s [%(levelname)s] %(message)s",
             handlers=[logging.StreamHandler(sys.stdout)],  # Output to console
         )
 
-    def _load_environment_variables(self):
-        """Loads environment variables from .env file."""
-        load_dotenv()  # Load .env if it exists
+    def _setup_cache(self):
+        """
+        Opens the on-disk cache of LLM results, so papers seen in earlier runs (or cross-listed
+        in several categories) are not summarized again. Rows are keyed on the paper ID and on
+        everything that shapes the output: model, summary language, user interest and the title
+        and abstract, so a revised paper (same unversioned ID) gets a new summary.
+        Paper metadata (including the LLM-extracted affiliations) is cached alongside it, as
+        are the IDs of papers already sent to the webhook (for skip_seen).
+        """
+        self.cache = sqlite3.connect(self.cache_path)
+        self.cache.execute("""CREATE TABLE IF NOT EXISTS papers (
+                id TEXT NOT NULL,
+                language TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                PRIMARY KEY (id, language)
+            )""")
+        columns = [row[1] for row in self.cache.execute("PRAGMA table_info(summaries)")]
+        if columns and "content_hash" not in columns:
+            # Rows from before content_hash can't be matched to a paper version; start over
+            self.cache.execute("DROP TABLE summaries")
+        self.cache.execute("""CREATE TABLE IF NOT EXISTS summaries (
+                id TEXT NOT NULL,
+                model TEXT NOT NULL,
+                language TEXT NOT NULL,
+                interest_hash TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                translated_title TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                relevance INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                PRIMARY KEY (id, model, language, interest_hash, content_hash)
+            )""")
+        self.cache.execute("""CREATE TABLE IF NOT EXISTS seen (
+                id TEXT PRIMARY KEY,
+                ts INTEGER NOT NULL
+            )""")
+        self.cache.commit()
+
+    def _cache_key(
+        self, paper_id: str, metadata: dict, user_interest: str | None
+    ) -> tuple[str, str, str, str, str]:
+        """Returns the primary key of a paper's row in the summaries cache."""
+        interest_hash = hashlib.sha256((user_interest or "").encode("utf-8")).hexdigest()
+        content = f"{metadata['title']}\0{metadata['abstract']}"
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return (
+            paper_id,
+            self.openai_model_name,
+            self.summary_language,
+            interest_hash,
+            content_hash,
+        )
+
+    def _get_cached_summary(
+        self, paper_id: str, metadata: dict, user_interest: str | None
+    ) -> PaperSummary | None:
+        """Looks up a previously generated summary, returning None on a cache miss."""
+        row = self.cache.execute(
+            """SELECT translated_title, summary, relevance FROM summaries
+            WHERE id = ? AND model = ? AND language = ? AND interest_hash = ?
+            AND content_hash = ?""",
+            self._cache_key(paper_id, metadata, user_interest),
+        ).fetchone()
+        if row is None:
+            return None
+        return PaperSummary(translated_title=row[0], summary=row[1], relevance=row[2])
+
+    def _cache_summary(
+        self, paper_id: str, metadata: dict, user_interest: str | None, result: PaperSummary
+    ):
+        """Stores a generated summary in the on-disk cache."""
+        self.cache.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                *self._cache_key(paper_id, metadata, user_interest),
+                result.translated_title,
+                result.summary,
+                result.relevance,
+                int(time.time()),
+            ),
+        )
+        self.cache.commit()
+
+    def _get_cached_metadata(self, paper_id: str, max_age_days: int = 30) -> dict | None:
+        """
+        Looks up the metadata of a paper, returning None on a cache miss. Entries expire after
+        max_age_days so that revised papers are eventually refreshed.
+        """
+        row = self.cache.execute(
+            "SELECT metadata FROM papers WHERE id = ? AND language = ? AND ts >= ?",
+            (paper_id, self.summary_language, int(time.time()) - max_age_days * 86400),
+        ).fetchone()
+        if row is None:
+            return None
+        return orjson.loads(row[0])
+
+    def _cache_metadata(self, paper_id: str, metadata: dict):
+        """Stores the metadata of a paper in the on-disk cache."""
+        self.cache.execute(
+            "INSERT OR REPLACE INTO papers VALUES (?, ?, ?, ?)",
+            (paper_id, self.summary_language, orjson.dumps(metadata).decode(), int(time.time())),
+        )
+        self.cache.commit()
 
+    def _drop_seen(self, paper_ids: list[str]) -> list[str]:
+        """Returns the given paper IDs minus those already sent to the webhook in earlier runs."""
+        seen = {
+            row[0]
+            for row in self.cache.execute(
+                f"SELECT id FROM seen WHERE id IN ({','.join('?' * len(paper_ids))})", paper_ids
+            )
+        }
+        if seen:
+            logging.info("Skipping %s papers already sent in earlier runs.", len(seen))
+        return [paper_id for paper_id in paper_ids if paper_id not in seen]
+
+    def _mark_seen(self, papers: list[dict]):
+        """Records the given papers as sent to the webhook."""
+        now = int(time.time())
+        self.cache.executemany(
+            "INSERT OR REPLACE INTO seen VALUES (?, ?)",
+            [(self._paper_id(paper["url"]), now) for paper in papers],
+        )
+        self.cache.commit()
+
+    def _load_environment_variables(self):
+        """Reads the settings from the environment (including the .env loaded in __init__)."""
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.openai_base_url = os.getenv("OPENAI_BASE_URL")
         self.openai_model_name = os.getenv("OPENAI_MODEL_NAME", "gpt-3.5-turbo")  # Default model
         self.summary_language = os.getenv("SUMMARY_LANGUAGE", "English")  # Default language
         self.webhook_url = os.getenv("WEBHOOK_URL")
+        # Opt-in: not every webhook receiver accepts Content-Encoding: gzip
+        self.webhook_gzip = os.getenv("WEBHOOK_GZIP", "").lower() in ("1", "true", "yes")
+        # Upper bound on papers processed concurrently (each paper issues several requests)
+        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
+        self.cache_path = os.getenv("CACHE_PATH", "arxiv_cache.db")
+        # Minimum seconds between requests to arXiv (its API terms ask for 3)
+        self.arxiv_request_interval = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))
 
         if not self.openai_api_key:
             logging.error("OPENAI_API_KEY not found in environment variables.")
             raise ValueError("OPENAI_API_KEY is required.")
 
-    def get_author_affiliations_from_tex(self, paper_id: str) -> str | None:
+    async def _complete(self, **request) -> str:
+        """
+        Sends a chat completion request and returns the message content. Deterministic
+        (temperature 0) requests are memoized for the rest of the run, so an identical prompt,
+        e.g. a paper seen again under another listing, does not pay for a second request.
+        """
+        deterministic = request.get("temperature") == 0
+        # OPT_NON_STR_KEYS: request dicts may have non-str keys, e.g. logit_bias token IDs
+        key = orjson.dumps(request, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        if deterministic and key in self._completions:
+            self._completions.move_to_end(key)
+            return self._completions[key]
+
+        completion = await self.client.chat.completions.create(**request)
+        content = completion.choices[0].message.content
+        if deterministic:
+            self._completions[key] = content
+            if len(self._completions) > 1024:
+                self._completions.popitem(last=False)  # Evict the least recently used entry
+        return content
+
+    async def get_author_affiliations_from_tex(self, paper_id: str) -> tuple[str | None, bool]:
         """
         Fetches and extracts author affiliations from the TeX source of an arXiv paper.
+        Returns the affiliations (None if there are none) and whether that result is final,
+        i.e. not caused by a transient failure (network, timeout, OpenAI error) and therefore
+        safe to cache.
         """
         try:
-            url = f"https://arxiv.org/src/{paper_id}"
-            logging.info(f"Fetching TeX source from: {url}")
-            response = requests.get(url)
+            url = f"https://export.arxiv.org/src/{paper_id}"
+            logging.info("Fetching TeX source from: %s", url)
+            response = await asyncio.to_thread(self.http.get, url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
 
             with tarfile.open(fileobj=io.BytesIO(response.content), mode="r:gz") as tar:
                 tex_files = [m for m in tar.getmembers() if m.name.endswith(".tex")]
                 if not tex_files:
-                    logging.warning(f"No .tex files found in the archive for paper {paper_id}.")
-                    return None
+                    logging.warning("No .tex files found in the archive for paper %s.", paper_id)
+                    return None, True
 
                 for member in tex_files:
                     tex_content = tar.extractfile(member).read().decode("utf-8", errors="ignore")
@@ -81,46 +532,34 @@ class ArxivSummarizer:
                         context_lines = self._filter_latex_lines(context_lines)
                         joined_context = "\n".join(context_lines)
 
-                        prompt = f"""The following lines are extracted from a .tex file.
-                        Your task is to identify and extract the author affiliations.
-                        Tex content:
-                        {joined_context}
-                        Output Format:
-                        - Only extract the top-level affiliation (e.g., University name, Company name, Research Institute name), avoiding overly specific details like departments, schools, or specific addresses.
-                        - If there are affiliations, list them without numbering, separated by semicolons (;).
-                        - If the number of unique top-level affiliations is more than three, list the first three, followed by "etc." to indicate the rest.
-                        - Respond in {self.summary_language}.
-                        - If no affiliations are found, respond with 'None'.
-                        - **Do not respond with anything other than the affiliations!**
-                        Examples of desired output (assuming English, do not include the double quotes):
-                        - "University of Example; Tech Innovations Inc."
-                        - "University A; Company B; Research Institute C; etc."
-                        - "None"
-                        Examples of what to avoid (too detailed):
-                        - "Department of Physics, University of Example" -> should be "University of Example"
-                        - "AI Lab, Company C, Country P" -> should be "Company C"
-                        - "School of Computer Science, University Z, City X" -> should be "University Z"
-                        """
-
-                        completion = self.client.chat.completions.create(
+                        affiliations = await self._complete(
                             model=self.openai_model_name,
-                            messages=[{"role": "user", "content": prompt}],
+                            messages=[
+                                {"role": "system", "content": self.affiliation_prompt},
+                                {"role": "user", "content": f"Tex content:\n{joined_context}"},
+                            ],
                             temperature=0.0,
+                            max_tokens=100,  # At most three affiliations followed by "etc."
                         )
-                        affiliations = completion.choices[0].message.content.strip()
+                        affiliations = affiliations.strip()
                         if affiliations.lower().startswith("none"):
-                            return None
-                        return affiliations
-            return None
+                            return None, True
+                        return affiliations, True
+            return None, True
+        except requests.exceptions.HTTPError as e:
+            logging.error("Error fetching TeX source for paper %s: %s", paper_id, e)
+            # A 404 means the paper has no source to fetch; anything else may succeed later
+            return None, e.response is not None and e.response.status_code == 404
         except requests.exceptions.RequestException as e:
-            logging.error(f"Network error fetching TeX source for paper {paper_id}: {e}")
-            return None
+            logging.error("Network error fetching TeX source for paper %s: %s", paper_id, e)
+            return None, False
         except tarfile.TarError as e:
-            logging.error(f"Error extracting TeX source for paper {paper_id}: {e}")
-            return None
+            # The source is not a tarball (e.g. a PDF-only submission); it won't become one
+            logging.error("Error extracting TeX source for paper %s: %s", paper_id, e)
+            return None, True
         except Exception as e:
-            logging.error(f"Error processing TeX source for paper {paper_id}: {e}")
-            return None
+            logging.error("Error processing TeX source for paper %s: %s", paper_id, e)
+            return None, False
 
     @staticmethod
     def _filter_latex_lines(lines_list: list[str]) -> list[str]:
@@ -184,213 +623,777 @@ class ArxivSummarizer:
     def get_paper_links_from_arxiv_page(self, url: str) -> list:
         """
         Fetches all paper links (starting with /abs/) from an arXiv page.
+        The page is parsed with lxml and the hrefs are selected with a single XPath query.
         """
-        logging.info(f"Fetching paper links from: {url}")
+        logging.info("Fetching paper links from: %s", url)
         try:
-            response = requests.get(url)
+            response = self.http.get(url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            soup = BeautifulSoup(response.content, "html.parser")
-            links = [
-                a["href"] for a in soup.find_all("a", href=True) if a["href"].startswith("/abs/")
-            ]
-            logging.info(f"Found {len(links)} raw links.")
+            tree = lxml.html.fromstring(response.content)
+            links = tree.xpath("//a[starts-with(@href, '/abs/')]/@href", smart_strings=False)
+            logging.info("Found %s raw links.", len(links))
             return links
         except requests.exceptions.RequestException as e:
-            logging.error(f"Network error fetching arXiv page {url}: {e}")
+            logging.error("Network error fetching arXiv page %s: %s", url, e)
             return []  # Re-raise the exception to be handled upstream
         except Exception as e:
             # Use _handle_exception for consistency if it should halt execution
-            logging.error(f"Error parsing arXiv page {url}: {e}")
+            logging.error("Error parsing arXiv page %s: %s", url, e)
             return []
 
-    def get_paper_metadata(self, paper_id: str) -> dict:
+    @staticmethod
+    def _paper_id(link: str) -> str:
+        """Returns the unversioned paper ID of an /abs/ link or URL."""
+        return re.sub(r"v\d+$", "", link.split("/abs/")[-1])
+
+    @staticmethod
+    def _format_authors(authors: list[str]) -> str:
+        """Joins author names, limiting them to avoid overly long strings."""
+        if len(authors) > 3:
+            authors = authors[:2] + ["et al."]
+        return ", ".join(authors)
+
+    def _parse_atom_entries(self, content: bytes) -> dict[str, dict]:
+        """
+        Parses an arXiv API Atom feed into a mapping of (unversioned) paper ID to metadata
+        (title, authors, abstract, url). Raises ET.ParseError on malformed XML.
+        """
+        atom = "{http://www.w3.org/2005/Atom}"
+        papers = {}
+        for entry in ET.fromstring(content).findall(f"{atom}entry"):
+            entry_url = entry.findtext(f"{atom}id", "")
+            if "arxiv.org/abs/" not in entry_url:
+                continue  # The API reports unknown IDs as an error entry
+            paper_id = self._paper_id(entry_url)
+            authors = [
+                author.findtext(f"{atom}name", "") for author in entry.findall(f"{atom}author")
+            ]
+            papers[paper_id] = {
+                "title": re.sub(r"\s+", " ", entry.findtext(f"{atom}title", "")).strip(),
+                "authors": self._format_authors(authors),
+                "abstract": entry.findtext(f"{atom}summary", ""),
+                "url": entry_url.replace("http://", "https://"),  # Ensure HTTPS
+            }
+        return papers
+
+    def get_papers_metadata(self, paper_ids: list[str], chunk_size: int = 200) -> dict[str, dict]:
         """
-        Retrieves paper metadata (title, abstract) from arXiv using the arxiv library.
-        The arxiv library typically fetches the latest version if a base ID is provided.
+        Retrieves metadata (title, authors, abstract, url) for many papers with one arXiv API
+        query per chunk of IDs, instead of one query per paper.
+        Returns a mapping of the requested (unversioned) paper ID to its metadata; papers
+        that could not be fetched or parsed are missing from the result.
         """
+        papers = {}
+        for start in range(0, len(paper_ids), chunk_size):
+            chunk = paper_ids[start : start + chunk_size]
+            try:
+                response = self.http.get(
+                    "https://export.arxiv.org/api/query",
+                    params={"id_list": ",".join(chunk), "max_results": len(chunk)},
+                    timeout=HTTP_TIMEOUT,
+                )
+                response.raise_for_status()
+                papers.update(self._parse_atom_entries(response.content))
+            except requests.exceptions.RequestException as e:
+                logging.error("Network error fetching metadata for %s papers: %s", len(chunk), e)
+            except ET.ParseError as e:
+                logging.error("Error parsing arXiv API response for %s papers: %s", len(chunk), e)
+        logging.info("Fetched metadata for %s of %s papers in bulk.", len(papers), len(paper_ids))
+        return papers
+
+    def get_new_papers_via_api(self, category: str, max_results: int = 200) -> dict[str, dict]:
+        """
+        Retrieves the most recent submissions in a category, with their metadata, from a single
+        arXiv API query. This replaces both the listing page scrape and the metadata lookup,
+        but returns the latest max_results submissions rather than exactly the papers of the
+        current /new announcement.
+        Returns a mapping of paper ID to metadata, newest first, or {} on error.
+        """
+        logging.info("Fetching the %s most recent papers in %s via the API", max_results, category)
         try:
-            client = arxiv.Client()
-            search = arxiv.Search(id_list=[paper_id])
-            results = client.results(search)
-            paper = next(results)  # Get the first result
-            authors = [author.name for author in paper.authors]
-            # Limit authors to avoid overly long strings
-            if len(authors) > 3:
-                authors = authors[:2] + ["et al."]
-            affiliations = self.get_author_affiliations_from_tex(paper_id)
+            response = self.http.get(
+                "https://export.arxiv.org/api/query",
+                params={
+                    "search_query": f"cat:{category}",
+                    "sortBy": "submittedDate",
+                    "sortOrder": "descending",
+                    "max_results": max_results,
+                },
+                timeout=HTTP_TIMEOUT,
+            )
+            response.raise_for_status()
+            papers = self._parse_atom_entries(response.content)
+            logging.info("Found %s papers via the API.", len(papers))
+            return papers
+        except requests.exceptions.RequestException as e:
+            logging.error("Network error querying arXiv API for category %s: %s", category, e)
+            return {}
+        except ET.ParseError as e:
+            logging.error("Error parsing arXiv API response for category %s: %s", category, e)
+            return {}
+
+    async def get_paper_metadata(self, paper_id: str, metadata: dict | None) -> dict:
+        """
+        Completes the bulk-fetched metadata (title, authors, abstract, url) of a paper with
+        its author affiliations. Results are cached on disk, so a paper seen in a recent run
+        needs neither its TeX source nor the affiliation request again; results missing
+        affiliations because of a transient error are not cached.
+        Raises ValueError if no metadata could be fetched for it.
+        """
+        try:
+            cached = self._get_cached_metadata(paper_id)
+            if cached is not None:
+                return cached
+            if metadata is None:
+                raise ValueError("paper was not found on arXiv")
+            affiliations, final = await self.get_author_affiliations_from_tex(paper_id)
             if not affiliations:
-                logging.info(f"No affiliations found for paper {paper_id}")
-            return {
-                "title": paper.title,
-                "authors": ", ".join(authors),
+                logging.info("No affiliations found for paper %s", paper_id)
+            metadata = {
+                "title": metadata["title"],
+                "authors": metadata["authors"],
                 "affiliations": affiliations,
-                "abstract": paper.summary,
-                "url": paper.entry_id.replace("http://", "https://"),  # Ensure HTTPS
+                "abstract": metadata["abstract"],
+                "url": metadata["url"],
             }
+            if final:
+                self._cache_metadata(paper_id, metadata)
+            else:
+                # Not cached, so the next run asks for the TeX source again
+                logging.info("Not caching metadata of paper %s after a transient error", paper_id)
+            return metadata
 
         except Exception as e:
             # Log and re-raise, but allow process_arxiv_url to catch and continue
-            logging.error(f"Error fetching metadata for paper ID {paper_id}: {e}")
+            logging.error("Error fetching metadata for paper ID %s: %s", paper_id, e)
             raise
 
-    def summarize_paper(self, title: str, abstract: str) -> tuple[str, str]:
+    @staticmethod
+    def _prompt_abstract(abstract: str, max_chars: int = MAX_ABSTRACT_CHARS) -> str:
+        """
+        Collapses the line breaks and indentation of an arXiv abstract, which cost tokens but
+        carry nothing, and cuts it at the last word boundary before max_chars.
+        """
+        abstract = re.sub(r"\s+", " ", abstract).strip()
+        if len(abstract) <= max_chars:
+            return abstract
+        return abstract[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+    @staticmethod
+    def _with_interest(system_prompt: str, user_interest: str) -> str:
         """
-        Summarizes the paper and translates its title using the OpenAI API.
-        Returns (translated_title, summary).
+        Appends the user's interest to a system prompt. It is the same for every paper of a run,
+        so it belongs to the shared prefix rather than to the per-paper user message.
+        """
+        return f"{system_prompt}\n\nUser's Interest: {user_interest}"
+
+    def _summary_request_body(
+        self, title: str, abstract: str, user_interest: str | None = None
+    ) -> dict:
+        """
+        Builds the chat completion request body for the combined summarize/score request.
+        Shared by the synchronous path and the Batch API path.
+        """
+        system_prompt = self.summary_prompt
+        if user_interest:
+            system_prompt = self._with_interest(
+                system_prompt + SUMMARY_RELEVANCE_FIELD, user_interest
+            )
+        paper = f"Title: {title}\nAbstract: {self._prompt_abstract(abstract)}"
+        return {
+            "model": self.openai_model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": paper},
+            ],
+            "temperature": 0.0,
+            # A title and up to 3 sentences; the cap bounds cost and time-to-last-token
+            "max_tokens": 400,
+            "response_format": {"type": "json_object"},
+        }
+
+    @staticmethod
+    def _parse_summary(content: str, user_interest: str | None = None) -> PaperSummary:
+        """Validates the JSON object returned by the combined summarize/score request."""
+        result = PaperSummary.model_validate_json(content)
+        if not user_interest:
+            result.relevance = 0  # Ignore a score the model volunteered without being asked
+        return result
+
+    @retry_on_transient_error()
+    async def summarize_and_score(
+        self, title: str, abstract: str, user_interest: str | None = None
+    ) -> PaperSummary:
+        """
+        Translates the title, summarizes the paper and, if user_interest is given, rates its
+        relevance, all in a single JSON-mode request to the OpenAI API.
+        Returns a PaperSummary (relevance is 0 when user_interest is not given).
         """
         try:
-            # Summarization
-            summary_prompt = f"""Summarize the following research paper. Provide the most important information in up to 3 sentences. Respond in {self.summary_language}.
+            content = await self._complete(
+                **self._summary_request_body(title, abstract, user_interest)
+            )
+            return self._parse_summary(content, user_interest)
 
-            Title: {title}
-            Abstract: {abstract}
-            """
-            summary_completion = self.client.chat.completions.create(
-                model=self.openai_model_name,
-                messages=[{"role": "user", "content": summary_prompt}],
-                temperature=0.7,  # Can be a bit creative for summary
+        except openai.APIConnectionError as e:
+            logging.error("Failed to connect to OpenAI API for summarization/translation: %s", e)
+            raise
+        except openai.RateLimitError as e:
+            logging.error("OpenAI API rate limit exceeded for summarization/translation: %s", e)
+            raise
+        except openai.InternalServerError as e:
+            logging.error("OpenAI API server error for summarization/translation: %s", e)
+            raise
+        except Exception as e:
+            # Log and re-raise, but allow process_arxiv_url to catch and continue
+            logging.error("Error during summarization or translation for paper '%s': %s", title, e)
+            raise
+
+    @retry_on_transient_error()
+    async def summarize_and_score_packed(
+        self, papers: list[tuple[str, str]], user_interest: str | None = None
+    ) -> list[PaperSummary | None]:
+        """
+        Translates the titles, summarizes and optionally rates several papers in one request,
+        sharing the instructions and round trip between them.
+
+        Args:
+            papers: (title, abstract) pairs.
+            user_interest: Optional user interest used to rate relevance.
+
+        Returns:
+            One PaperSummary per paper, in input order, or None for papers the LLM left out.
+        """
+        system_prompt = self.packed_summary_prompt
+        if user_interest:
+            system_prompt = self._with_interest(
+                system_prompt + SUMMARY_RELEVANCE_FIELD, user_interest
             )
-            summary = summary_completion.choices[0].message.content.strip()
+        content = "\n\n".join(
+            f"[{i}] Title: {title}\nAbstract: {self._prompt_abstract(abstract)}"
+            for i, (title, abstract) in enumerate(papers, start=1)
+        )
 
-            # Title Translation
-            title_prompt = f"Translate the following title of article to {self.summary_language}, only respond with the translated title: {title}"
-            title_completion = self.client.chat.completions.create(
+        try:
+            response = await self._complete(
                 model=self.openai_model_name,
-                messages=[{"role": "user", "content": title_prompt}],
-                temperature=0.0,  # Strict translation
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": content},
+                ],
+                temperature=0.0,
+                max_tokens=400 * len(papers),  # Same per-paper cap as the single request
+                response_format={"type": "json_object"},
             )
-            translated_title = title_completion.choices[0].message.content.strip()
-
-            return translated_title, summary
+            results: list[PaperSummary | None] = [None] * len(papers)
+            for item in PackedSummaries.model_validate_json(response).papers:
+                if 1 <= item.index <= len(papers):
+                    result = PaperSummary(**item.model_dump(exclude={"index"}))
+                    if not user_interest:
+                        result.relevance = 0  # Ignore a score the model volunteered
+                    results[item.index - 1] = result
+            return results
 
         except openai.APIConnectionError as e:
-            logging.error(f"Failed to connect to OpenAI API for summarization/translation: {e}")
+            logging.error("Failed to connect to OpenAI API for packed summarization: %s", e)
             raise
         except openai.RateLimitError as e:
-            logging.error(f"OpenAI API rate limit exceeded for summarization/translation: {e}")
+            logging.error("OpenAI API rate limit exceeded for packed summarization: %s", e)
+            raise
+        except openai.InternalServerError as e:
+            logging.error("OpenAI API server error for packed summarization: %s", e)
             raise
         except Exception as e:
-            # Log and re-raise, but allow process_arxiv_url to catch and continue
-            logging.error(f"Error during summarization or translation for paper '{title}': {e}")
+            logging.error("Error during packed summarization of %s papers: %s", len(papers), e)
             raise
 
-    def evaluate_relevance(self, title: str, abstract: str, user_interest: str) -> int:
+    @retry_on_transient_error()
+    async def _retrieve_batch(self, batch_id: str):
+        """Fetches the current state of a Batch API job."""
+        return await self.client.batches.retrieve(batch_id)
+
+    @retry_on_transient_error()
+    async def _download_file(self, file_id: str):
+        """Downloads the content of a file, e.g. the output of a Batch API job."""
+        return await self.client.files.content(file_id)
+
+    async def summarize_and_score_batch(
+        self,
+        papers: dict[str, dict],
+        user_interest: str | None = None,
+        poll_interval: float = 30.0,
+    ) -> dict[str, PaperSummary]:
+        """
+        Runs the combined summarize/score request for many papers through the OpenAI Batch API,
+        which is billed at half price and does not count against the synchronous rate limits.
+
+        Args:
+            papers: Mapping of paper ID to its metadata (must contain 'title' and 'abstract').
+            user_interest: Optional user interest used to rate relevance.
+            poll_interval: Seconds to wait between batch status checks.
+
+        Returns:
+            A mapping of paper ID to PaperSummary for every request that succeeded.
+        """
+        lines = [
+            orjson.dumps(
+                {
+                    "custom_id": paper_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._summary_request_body(
+                        metadata["title"], metadata["abstract"], user_interest
+                    ),
+                }
+            )
+            for paper_id, metadata in papers.items()
+        ]
+        input_file = await self.client.files.create(
+            file=("arxiv_summary_batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logging.info("Submitted batch %s with %s requests.", batch.id, len(lines))
+
+        # The batch is already submitted and billed: transient errors while polling or
+        # downloading are retried, and if that fails the batch ID is logged so the results can
+        # still be fetched by hand instead of being paid for again
+        try:
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                batch = await self._retrieve_batch(batch.id)
+                logging.info("Batch %s status: %s", batch.id, batch.status)
+
+            if not batch.output_file_id:
+                logging.error(
+                    "Batch %s finished with status '%s' and no output (error file: %s).",
+                    batch.id,
+                    batch.status,
+                    batch.error_file_id,
+                )
+                return {}
+
+            output = await self._download_file(batch.output_file_id)
+        except openai.APIError as e:
+            logging.error(
+                "Giving up on batch %s (status '%s', output file: %s, error file: %s): %s",
+                batch.id,
+                batch.status,
+                batch.output_file_id,
+                batch.error_file_id,
+                e,
+            )
+            return {}
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            paper_id = record["custom_id"]
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logging.error(
+                    "Batch request for paper ID %s failed: %s",
+                    paper_id,
+                    record.get("error") or response,
+                )
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[paper_id] = self._parse_summary(content, user_interest)
+            except Exception as e:
+                logging.error("Error parsing batch result for paper ID %s: %s", paper_id, e)
+        return results
+
+    @retry_on_transient_error()
+    async def evaluate_relevance(self, title: str, abstract: str, user_interest: str) -> int:
         """
         Evaluates the relevance of a paper to the user's interest using the OpenAI API.
+        Only the beginning of the abstract is sent: it is enough to classify the paper, and the
+        papers rejected here never need the rest.
         Returns 0 (low), 1 (medium), or 2 (high).
         """
-        prompt = f"""Given the following research paper's title and abstract, and a (list of) user's area of interest,
-        rate the relevance of the paper to the user's interest.
-        Respond with only a single integer:
-        0 for Low relevance to all of the user's interests,
-        1 for Medium relevance to any of the user's interests,
-        2 for High relevance to any of the user's interests.
-
-        User's Interest: {user_interest}
+        prompt = f"""Paper Title: {title}
+Paper Abstract: {self._prompt_abstract(abstract, 600)}
 
-        Paper Title: {title}
-        Paper Abstract: {abstract}
+Relevance Score (0, 1, or 2):"""
 
-        Relevance Score (0, 1, or 2):"""
+        extra_args = {}
+        if not self.openai_base_url:
+            # Token IDs of "0", "1" and "2" in OpenAI's tokenizers; pinning them forces a valid
+            # digit. Skipped for other providers, whose tokenizers use different IDs.
+            extra_args["logit_bias"] = {"15": 100, "16": 100, "17": 100}
 
         try:
-            completion = self.client.chat.completions.create(
+            score_str = await self._complete(
                 model=self.openai_model_name,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {
+                        "role": "system",
+                        "content": self._with_interest(RELEVANCE_PREFIX, user_interest),
+                    },
+                    {"role": "user", "content": prompt},
+                ],
                 temperature=0.0,  # Make it deterministic for score
                 max_tokens=1,  # We only expect a single digit
+                **extra_args,
             )
-            score_str = completion.choices[0].message.content.strip()
+            score_str = score_str.strip()
             try:
                 score = int(score_str)
                 if score not in [0, 1, 2]:
                     logging.warning(
-                        f"LLM returned an unexpected relevance score: '{score_str}'. Defaulting to 0 for paper '{title}'."
+                        "LLM returned an unexpected relevance score: '%s'. Defaulting to 0 for paper '%s'.",
+                        score_str,
+                        title,
                     )
                     return 0
                 return score
             except ValueError:
                 logging.warning(
-                    f"Could not parse relevance score (not an integer) from LLM for paper '{title}'. Response was: '{score_str}'. Defaulting to 0."
+                    "Could not parse relevance score (not an integer) from LLM for paper '%s'. Response was: '%s'. Defaulting to 0.",
+                    title,
+                    score_str,
                 )
                 return 0
         except openai.APIConnectionError as e:
-            logging.error(f"Failed to connect to OpenAI API for relevance check: {e}")
+            logging.error("Failed to connect to OpenAI API for relevance check: %s", e)
             raise  # Re-raise critical API errors
         except openai.RateLimitError as e:
-            logging.error(f"OpenAI API rate limit exceeded for relevance check: {e}")
+            logging.error("OpenAI API rate limit exceeded for relevance check: %s", e)
+            raise  # Re-raise critical API errors
+        except openai.InternalServerError as e:
+            logging.error("OpenAI API server error for relevance check: %s", e)
             raise  # Re-raise critical API errors
-        except Exception as e:  # Catch any other unexpected errors from OpenAI client
+        except Exception as e:
+            # Re-raise instead of scoring 0, which would silently filter the paper out;
+            # process_arxiv_url logs the error and skips the paper
             logging.error(
-                f"An unexpected error occurred during relevance evaluation for paper '{title}': {e}"
+                "An unexpected error occurred during relevance evaluation for paper '%s': %s",
+                title,
+                e,
             )
-            return 0  # Default to low relevance on general error
+            raise
 
-    def process_arxiv_url(
-        self, category: str, user_interest: str | None = None, filter_level: str = "none"
+    def _below_filter_level(
+        self, run: "PipelineRun", paper_id: str, title: str, relevance_score: int
+    ) -> bool:
+        """Returns whether a paper scores below the run's filter level, logging the skip."""
+        if run.min_relevance_score == -1 or relevance_score >= run.min_relevance_score:
+            return False
+        logging.info(
+            "Paper '%s' (ID: %s) has relevance %s, which is below filter level '%s' (%s). Skipping.",
+            title,
+            paper_id,
+            relevance_score,
+            run.filter_level,
+            run.min_relevance_score,
+        )
+        return True
+
+    async def _prepare(
+        self, run: "PipelineRun", paper_id: str
+    ) -> tuple[dict, PaperSummary | None, int | None] | None:
+        """
+        Fetches the metadata of a paper, then either its cached summary or, when filtering,
+        its relevance from the cheap single-token request, so papers below the filter level
+        never pay for summarization. Returns (metadata, cached summary or None, pre-filter
+        score or None), or None for papers that are filtered out.
+        """
+        metadata = await self.get_paper_metadata(paper_id, run.prefetched.get(paper_id))
+        title = metadata["title"]
+
+        result = self._get_cached_summary(paper_id, metadata, run.user_interest)
+        if result is not None:
+            logging.info("Using cached summary for paper ID %s", paper_id)
+            if self._below_filter_level(run, paper_id, title, result.relevance):
+                return None
+            return metadata, result, None
+
+        if run.min_relevance_score > 0:
+            relevance_score = await self.evaluate_relevance(
+                title, metadata["abstract"], run.user_interest
+            )
+            logging.info("Relevance for '%s': %s", title, relevance_score)
+            if self._below_filter_level(run, paper_id, title, relevance_score):
+                return None
+            return metadata, None, relevance_score
+
+        return metadata, None, None
+
+    def _store(
+        self,
+        run: "PipelineRun",
+        paper_id: str,
+        metadata: dict,
+        result: PaperSummary,
+        relevance_score: int | None,
+    ):
+        """Records a freshly generated summary; relevance_score is the pre-filter score, if any."""
+        if relevance_score is not None:
+            result.relevance = relevance_score
+        elif run.user_interest:
+            logging.info("Relevance for '%s': %s", metadata["title"], result.relevance)
+        self._cache_summary(paper_id, metadata, run.user_interest, result)
+
+    @staticmethod
+    def _with_summary(metadata: dict, result: PaperSummary) -> dict:
+        """Adds the summary fields to a paper's metadata."""
+        metadata["summary"] = result.summary
+        metadata["translated_title"] = result.translated_title
+        metadata["relevance"] = result.relevance  # 0 if no interest specified
+        return metadata
+
+    async def _process_one(
+        self, run: "PipelineRun", paper_id: str, prepared: tuple | None = None
+    ) -> dict | None:
+        """
+        Prepares (unless already done) and summarizes a single paper. Returns its metadata
+        with the summary fields, or None if it was filtered out or failed.
+        """
+        async with run.sem:
+            try:
+                if prepared is None:
+                    logging.info("Processing paper ID: %s", paper_id)
+                    prepared = await self._prepare(run, paper_id)
+                    if prepared is None:
+                        return None  # Skip this paper
+                metadata, result, relevance_score = prepared
+                if result is None:
+                    # Relevance comes with the summary unless it was pre-scored for filtering
+                    result = await self.summarize_and_score(
+                        metadata["title"],
+                        metadata["abstract"],
+                        run.user_interest if relevance_score is None else None,
+                    )
+                    self._store(run, paper_id, metadata, result, relevance_score)
+                metadata = self._with_summary(metadata, result)
+                if run.on_paper is not None:
+                    await run.on_paper(metadata)
+                return metadata
+            except (
+                openai.APIConnectionError,
+                openai.InternalServerError,
+                openai.RateLimitError,
+            ) as e:
+                # Log a warning and skip this paper if retries fail.
+                logging.warning(
+                    "OpenAI API error for paper ID %s after retries: %s. Skipping paper.",
+                    paper_id,
+                    e,
+                )
+                return None
+            except Exception as e:
+                # For other errors (e.g., arXiv API, parsing), just log and skip this paper
+                logging.error("Failed to process paper ID %s. Error: %s", paper_id, e)
+                return None
+
+    async def _prepare_one(self, run: "PipelineRun", paper_id: str) -> tuple | None:
+        """_prepare for one paper, bounded by the semaphore; returns None on failure."""
+        async with run.sem:
+            logging.info("Processing paper ID: %s", paper_id)
+            try:
+                return await self._prepare(run, paper_id)
+            except Exception as e:
+                logging.error("Failed to process paper ID %s. Error: %s", paper_id, e)
+                return None
+
+    async def _process_packed(
+        self, run: "PipelineRun", paper_ids: list[str], papers_per_request: int
+    ) -> list[dict]:
+        """
+        Summarizes the papers needing a summary papers_per_request at a time; any paper the
+        packed response leaves out (or that fails with it) is retried on its own.
+        """
+        prepared = dict(
+            zip(
+                paper_ids,
+                await asyncio.gather(*(self._prepare_one(run, pid) for pid in paper_ids)),
+            )
+        )
+        pending = [pid for pid, item in prepared.items() if item is not None and item[1] is None]
+        interest = run.user_interest if run.min_relevance_score <= 0 else None
+
+        async def summarize_chunk(chunk: list[str]) -> list[dict | None]:
+            async with run.sem:
+                try:
+                    results = await self.summarize_and_score_packed(
+                        [
+                            (prepared[pid][0]["title"], prepared[pid][0]["abstract"])
+                            for pid in chunk
+                        ],
+                        interest,
+                    )
+                except Exception as e:
+                    logging.warning("Packed request failed (%s). Retrying papers one by one.", e)
+                    results = []
+            for pid, result in zip(chunk, results):
+                if result is not None:
+                    metadata, _, relevance_score = prepared[pid]
+                    self._store(run, pid, metadata, result, relevance_score)
+                    prepared[pid] = (metadata, result, relevance_score)
+            # Finish the chunk right away, so streamed papers do not wait for the other chunks
+            return await asyncio.gather(
+                *(self._process_one(run, pid, prepared[pid]) for pid in chunk)
+            )
+
+        chunks = [
+            pending[i : i + papers_per_request] for i in range(0, len(pending), papers_per_request)
+        ]
+        # Papers with a cached summary need no request and are finished immediately
+        ready = [pid for pid, item in prepared.items() if item is not None and item[1] is not None]
+        outcomes = await asyncio.gather(
+            asyncio.gather(*(self._process_one(run, pid, prepared[pid]) for pid in ready)),
+            *(summarize_chunk(chunk) for chunk in chunks),
+        )
+        processed = {}
+        for pids, results in zip([ready, *chunks], outcomes):
+            processed.update(zip(pids, results))
+        # Keep the listing order
+        return [processed[pid] for pid in prepared if processed.get(pid) is not None]
+
+    async def _fetch_metadata(self, run: "PipelineRun", paper_id: str) -> tuple[str, dict] | None:
+        """Returns (paper_id, metadata), or None if the metadata could not be fetched."""
+        async with run.sem:
+            try:
+                return paper_id, await self.get_paper_metadata(
+                    paper_id, run.prefetched.get(paper_id)
+                )
+            except Exception as e:
+                logging.error("Failed to process paper ID %s. Error: %s", paper_id, e)
+                return None
+
+    async def _process_batch(self, run: "PipelineRun", paper_ids: list[str]) -> list[dict]:
+        """
+        Summarizes the papers without a cached summary in one Batch API job. Relevance comes
+        back together with the summary, so filtering happens afterwards: a second batch round
+        trip would cost more time than the summaries it saves.
+        """
+        fetched = await asyncio.gather(*(self._fetch_metadata(run, pid) for pid in paper_ids))
+        metadata_by_id = dict(item for item in fetched if item is not None)
+        if not metadata_by_id:
+            return []
+        results = {}
+        for paper_id, metadata in metadata_by_id.items():
+            cached = self._get_cached_summary(paper_id, metadata, run.user_interest)
+            if cached is not None:
+                results[paper_id] = cached
+        uncached = {
+            paper_id: metadata
+            for paper_id, metadata in metadata_by_id.items()
+            if paper_id not in results
+        }
+        logging.info("%s cached summaries, %s papers to submit.", len(results), len(uncached))
+        if uncached:
+            batch_results = await self.summarize_and_score_batch(uncached, run.user_interest)
+            for paper_id, result in batch_results.items():
+                self._cache_summary(paper_id, uncached[paper_id], run.user_interest, result)
+            results.update(batch_results)
+
+        papers = []
+        for paper_id, metadata in metadata_by_id.items():
+            result = results.get(paper_id)
+            if result is None:
+                continue
+            if self._below_filter_level(run, paper_id, metadata["title"], result.relevance):
+                continue
+            metadata = self._with_summary(metadata, result)
+            papers.append(metadata)
+            if run.on_paper is not None:
+                await run.on_paper(metadata)
+        return papers
+
+    async def process_arxiv_url(
+        self,
+        category: str,
+        user_interest: str | None = None,
+        filter_level: str = "none",
+        use_batch: bool = False,
+        use_api_listing: bool = False,
+        papers_per_request: int = 1,
+        skip_seen: bool = False,
+        on_paper: Callable[[dict], Awaitable[None]] | None = None,
     ) -> list[dict] | None:
         """
         Main function to orchestrate the process of fetching, summarizing, and evaluating papers.
+        Papers are processed concurrently, bounded by max_concurrent_requests.
+        With papers_per_request > 1, that many papers are summarized in each LLM request.
+        With use_batch, all LLM requests are instead submitted as one OpenAI Batch API job.
+        With use_api_listing, the papers and their metadata come from one arXiv API query
+        instead of the /new listing page (which is still used if the query returns nothing).
+        With skip_seen, papers already sent to the webhook in earlier runs are left out.
+        If on_paper is given, it is awaited with each paper as soon as that paper is ready.
         Returns a list of processed paper metadata dictionaries.
         """
-        arxiv_url = f"https://arxiv.org/list/{category}/new"
-        papers = []
+        # export.arxiv.org is the host arXiv designates for programmatic access
+        arxiv_url = f"https://export.arxiv.org/list/{category}/new"
 
-        # Define relevance score mapping for filtering
-        relevance_thresholds = {"low": 0, "mid": 1, "high": 2, "none": -1}  # -1 means no filtering
         if not user_interest and filter_level != "none":
             logging.warning(
-                f"User interest not specified, but filter level '{filter_level}' is set. Skipping filtering."
+                "User interest not specified, but filter level '%s' is set. Skipping filtering.",
+                filter_level,
             )
             filter_level = "none"
-        min_relevance_score = relevance_thresholds.get(filter_level.lower(), -1)
 
         try:
-            paper_links = self.get_paper_links_from_arxiv_page(arxiv_url)
-
-            for link in paper_links:
-                paper_id = link.split("/")[-1]
-                logging.info(f"Processing paper ID: {paper_id}")
-                try:
-                    metadata = self.get_paper_metadata(paper_id)
-                    title = metadata["title"]
-                    abstract = metadata["abstract"]
-
-                    relevance_score = 0  # Default to 0
-                    if user_interest:
-                        relevance_score = self.evaluate_relevance(title, abstract, user_interest)
-                        logging.info(f"Relevance for '{title}': {relevance_score}")
+            prefetched = {}
+            if use_api_listing:
+                prefetched = await asyncio.to_thread(self.get_new_papers_via_api, category)
+                paper_ids = list(prefetched)
+                if skip_seen and paper_ids:
+                    paper_ids = self._drop_seen(paper_ids)
+                if not prefetched:
+                    logging.warning(
+                        "arXiv API returned no papers. Falling back to the listing page."
+                    )
 
-                    metadata["relevance"] = relevance_score
+            if not prefetched:
+                paper_links = await asyncio.to_thread(
+                    self.get_paper_links_from_arxiv_page, arxiv_url
+                )
+                # Drop version suffixes and the duplicates left by cross-listings, keeping listing order
+                paper_ids = list(dict.fromkeys(self._paper_id(link) for link in paper_links))
+                if len(paper_ids) < len(paper_links):
+                    logging.info(
+                        "Deduplicated %s links to %s papers.", len(paper_links), len(paper_ids)
+                    )
+                if skip_seen and paper_ids:
+                    paper_ids = self._drop_seen(paper_ids)
 
-                    # Apply filtering based on relevance_score and filter_level
-                    if min_relevance_score != -1 and relevance_score < min_relevance_score:
-                        logging.info(
-                            f"Paper '{title}' (ID: {paper_id}) has relevance {relevance_score}, which is below filter level '{filter_level}' ({min_relevance_score}). Skipping summarization."
-                        )
-                        continue  # Skip to the next paper
-
-                    translated_title, summary = self.summarize_paper(title, abstract)
-                    metadata["summary"] = summary
-                    metadata["translated_title"] = translated_title
-
-                    if user_interest:
-                        relevance_score = self.evaluate_relevance(title, abstract, user_interest)
-                        metadata["relevance"] = relevance_score
-                        logging.info(f"Relevance for '{title}': {relevance_score}")
-                    else:
-                        metadata["relevance"] = 0  # Default to 0 if no interest specified
-
-                    papers.append(metadata)
-                except (openai.APIConnectionError, openai.RateLimitError) as e:
-                    # Log a warning and skip to the next paper if retries fail.
-                    logging.warning(
-                        f"OpenAI API error for paper ID {paper_id} after retries: {e}. Skipping paper."
+                # One bulk metadata query for the papers not cached yet; papers missing from it
+                # (a chunk that failed after retries, or an entry the API left out) get one more
+                # query in small chunks, so a single bad ID costs at most its own chunk
+                uncached = [
+                    paper_id
+                    for paper_id in paper_ids
+                    if self._get_cached_metadata(paper_id) is None
+                ]
+                prefetched = {}
+                if uncached:
+                    prefetched = await asyncio.to_thread(self.get_papers_metadata, uncached)
+                missing = [paper_id for paper_id in uncached if paper_id not in prefetched]
+                if missing:
+                    prefetched.update(
+                        await asyncio.to_thread(self.get_papers_metadata, missing, 20)
                     )
-                    continue
-                except Exception as e:
-                    # For other errors (e.g., arxiv library, parsing), just log and continue to the next paper
-                    logging.error(f"Failed to process paper ID {paper_id}. Error: {e}")
+
+            run = PipelineRun(
+                user_interest, filter_level, prefetched, on_paper, self.max_concurrent_requests
+            )
+            if use_batch:
+                papers = await self._process_batch(run, paper_ids)
+            elif papers_per_request > 1:
+                papers = await self._process_packed(run, paper_ids, papers_per_request)
+            else:
+                # gather preserves the listing order of the results
+                results = await asyncio.gather(
+                    *(self._process_one(run, paper_id) for paper_id in paper_ids)
+                )
+                papers = [metadata for metadata in results if metadata is not None]
 
             if not papers:
                 logging.warning("No papers were successfully processed.")
@@ -401,10 +1404,10 @@ class ArxivSummarizer:
             return papers
 
         except requests.exceptions.RequestException as e:
-            logging.error(f"Network error fetching arXiv page or during initial processing: {e}")
+            logging.error("Network error fetching arXiv page or during initial processing: %s", e)
             return None
         except Exception as e:
-            logging.error(f"An unhandled error occurred during overall paper processing: {e}")
+            logging.error("An unhandled error occurred during overall paper processing: %s", e)
             return None
 
     def send_arxiv_data_via_webhook(self, data_list: list, category_with_suffix: str):
@@ -424,55 +1427,81 @@ class ArxivSummarizer:
             return None
 
         try:
-            # Construct the message content by concatenating information from all papers.
+            # Construct the message content from all papers. Lines are collected in a list and
+            # joined once; an empty line separates the header and each paper.
             today = datetime.datetime.now().strftime("%Y-%m-%d")
-            message_text = f"{today} Arxiv papers summary for {category_with_suffix}:\n\n"
+            relevance_map = {0: "Low", 1: "Medium", 2: "High"}
+            lines = [f"{today} Arxiv papers summary for {category_with_suffix}:"]
             for paper_data in data_list:
-                message_text += f"Title: {paper_data['title']}\n"
-                message_text += f"{paper_data['translated_title']}\n"
-                message_text += f"Authors: {paper_data['authors']}\n"
+                lines.append("")
+                lines.append(f"Title: {paper_data['title']}")
+                lines.append(paper_data["translated_title"])
+                lines.append(f"Authors: {paper_data['authors']}")
                 if paper_data.get("affiliations"):
-                    message_text += f"Affiliations: {paper_data['affiliations']}\n"
-                message_text += f"URL: {paper_data['url']}\n"
+                    lines.append(f"Affiliations: {paper_data['affiliations']}")
+                lines.append(f"URL: {paper_data['url']}")
                 if "relevance" in paper_data:  # Add relevance if it exists
-                    relevance_map = {0: "Low", 1: "Medium", 2: "High"}
-                    message_text += (
-                        f"Relevance: {relevance_map.get(paper_data['relevance'], 'N/A')}\n"
-                    )
-                message_text += f"Summary: {paper_data['summary']}\n\n"
-            # Remove the trailing newline characters
-            message_text = message_text.rstrip("\n")
+                    lines.append(f"Relevance: {relevance_map.get(paper_data['relevance'], 'N/A')}")
+                lines.append(f"Summary: {paper_data['summary']}")
+            message_text = "\n".join(lines)
 
             # Construct the message payload.
             content = {"text": message_text}
 
             payload = {"msg_type": "text", "content": content}
 
-            # Convert the payload to JSON.
-            json_payload = json.dumps(payload)
+            # Convert the payload to JSON. orjson emits UTF-8 bytes directly, so the body is
+            # not encoded a second time.
+            json_payload = orjson.dumps(payload)
 
             # Send the request to the webhook.
-            headers = {"Content-Type": "application/json"}
             logging.info(
-                f"Sending {len(data_list)} papers to webhook for category {category_with_suffix}..."
+                "Sending %s papers to webhook for category %s...",
+                len(data_list),
+                category_with_suffix,
             )
-            response = requests.post(self.webhook_url, data=json_payload, headers=headers)
+            if self.webhook_gzip:
+                response = self.http.post(
+                    self.webhook_url,
+                    data=gzip.compress(json_payload),
+                    headers=WEBHOOK_GZIP_HEADERS,
+                    timeout=HTTP_TIMEOUT,
+                )
+                if response.status_code == 415:
+                    logging.warning(
+                        "Webhook does not accept gzip-encoded bodies. Sending uncompressed."
+                    )
+                    self.webhook_gzip = False
+            if not self.webhook_gzip:
+                response = self.http.post(
+                    self.webhook_url,
+                    data=json_payload,
+                    headers=WEBHOOK_HEADERS,
+                    timeout=HTTP_TIMEOUT,
+                )
 
             # Check the response status code.
             if response.status_code == 200:
                 logging.info(
-                    f"Successfully sent data for {len(data_list)} papers in batch '{category_with_suffix}'."
+                    "Successfully sent data for %s papers in batch '%s'.",
+                    len(data_list),
+                    category_with_suffix,
                 )
                 return response
             else:
                 logging.error(
-                    f"Error sending data for batch '{category_with_suffix}'. Status code: {response.status_code}. Response text: {response.text}"
+                    "Error sending data for batch '%s'. Status code: %s. Response text: %s",
+                    category_with_suffix,
+                    response.status_code,
+                    response.text,
                 )
                 return None
 
         except Exception as e:
             logging.error(
-                f"An error occurred while sending webhook for batch '{category_with_suffix}': {e}"
+                "An error occurred while sending webhook for batch '%s': %s",
+                category_with_suffix,
+                e,
             )
             return None
 
@@ -482,9 +1511,68 @@ class ArxivSummarizer:
         max_papers_split: int = 10,
         user_interest: str | None = None,
         filter_level: str = "none",
+        use_batch: bool = False,
+        use_api_listing: bool = False,
+        papers_per_request: int = 1,
+        stream_webhook: bool = False,
+        skip_seen: bool = False,
+    ):
+        asyncio.run(
+            self._run_async(
+                category,
+                max_papers_split,
+                user_interest,
+                filter_level,
+                use_batch,
+                use_api_listing,
+                papers_per_request,
+                stream_webhook,
+                skip_seen,
+            )
+        )
+
+    async def _run_async(
+        self,
+        category: str,
+        max_papers_split: int,
+        user_interest: str | None,
+        filter_level: str,
+        use_batch: bool,
+        use_api_listing: bool,
+        papers_per_request: int,
+        stream_webhook: bool,
+        skip_seen: bool,
     ):
-        logging.info(f"Starting Arxiv summarization for category: {category}")
-        papers = self.process_arxiv_url(category, user_interest, filter_level)
+        # Blocking calls (listing page, arXiv API, TeX sources, webhook) run on this pool
+        # via asyncio.to_thread; sizing it like the semaphore caps parallel requests to arXiv
+        # regardless of the machine's CPU count.
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=self.max_concurrent_requests, thread_name_prefix="arxiv-summary"
+            )
+        )
+        logging.info("Starting Arxiv summarization for category: %s", category)
+        if stream_webhook and self.webhook_url:
+            await self._stream_to_webhook(
+                category,
+                max_papers_split,
+                user_interest,
+                filter_level,
+                use_batch,
+                use_api_listing,
+                papers_per_request,
+                skip_seen,
+            )
+            return
+        papers = await self.process_arxiv_url(
+            category,
+            user_interest,
+            filter_level,
+            use_batch,
+            use_api_listing,
+            papers_per_request,
+            skip_seen,
+        )
         if not papers:
             logging.warning("Processing failed or no papers were found. Exiting.")
             return  # Exit gracefully if no papers or error during processing
@@ -492,22 +1580,87 @@ class ArxivSummarizer:
         # Sort papers by relevance if user_interest is set
         if user_interest:
             papers.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-            logging.info(f"Sorted {len(papers)} papers by relevance (descending).")
+            logging.info("Sorted %s papers by relevance (descending).", len(papers))
 
         if self.webhook_url:
             num_splits = (len(papers) + max_papers_split - 1) // max_papers_split
             split_size = (len(papers) + num_splits - 1) // num_splits
             papers_split = [papers[i : i + split_size] for i in range(0, len(papers), split_size)]
+            sends = []
             for i, papers in enumerate(papers_split):
                 if len(papers_split) == 1:
                     suffix = ""
                 else:
                     suffix = f" ({i+1}/{len(papers_split)})"
 
-                self.send_arxiv_data_via_webhook(papers, category + suffix)
+                sends.append(self._send_to_webhook(papers, category + suffix, skip_seen))
+            # The batches are independent POSTs on the shared session, so send them concurrently
+            await asyncio.gather(*sends)
         else:
             logging.info("Webhook URL not configured. Papers will not be sent.")
 
+    async def _send_to_webhook(
+        self, papers: list[dict], category_with_suffix: str, mark_seen: bool
+    ):
+        """Sends one webhook message off the event loop, then records its papers as seen."""
+        response = await asyncio.to_thread(
+            self.send_arxiv_data_via_webhook, papers, category_with_suffix
+        )
+        if response is not None and mark_seen:
+            self._mark_seen(papers)
+
+    async def _stream_to_webhook(
+        self,
+        category: str,
+        max_papers_split: int,
+        user_interest: str | None,
+        filter_level: str,
+        use_batch: bool,
+        use_api_listing: bool,
+        papers_per_request: int,
+        skip_seen: bool,
+    ):
+        """
+        Sends papers to the webhook max_papers_split at a time as soon as they are summarized,
+        instead of waiting for the whole listing. Messages are numbered "part 1", "part 2", ...
+        because the total is not known up front, and papers are not sorted by relevance.
+        """
+        if user_interest:
+            logging.warning("Streaming to the webhook: papers will not be sorted by relevance.")
+        pending = []
+        sends = []
+
+        def flush():
+            sends.append(
+                asyncio.create_task(
+                    self._send_to_webhook(
+                        pending.copy(), f"{category} (part {len(sends) + 1})", skip_seen
+                    )
+                )
+            )
+            pending.clear()
+
+        async def on_paper(paper: dict):
+            pending.append(paper)
+            if len(pending) >= max_papers_split:
+                flush()
+
+        papers = await self.process_arxiv_url(
+            category,
+            user_interest,
+            filter_level,
+            use_batch,
+            use_api_listing,
+            papers_per_request,
+            skip_seen,
+            on_paper,
+        )
+        if pending:
+            flush()
+        if not papers:
+            logging.warning("Processing failed or no papers were found.")
+        await asyncio.gather(*sends)
+
 
 if __name__ == "__main__":
     import argparse
@@ -535,13 +1688,50 @@ if __name__ == "__main__":
         choices=["low", "mid", "high", "none"],
         help="Filter papers based on relevance: 'low' (score >=0), 'mid' (score >=1), 'high' (score >=2), 'none' (no filtering). Default: 'none'.",
     )
+    parser.add_argument(
+        "--use_batch",
+        action="store_true",
+        help="Submit all LLM requests as one OpenAI Batch API job (half price, but results may take up to 24 hours).",
+    )
+    parser.add_argument(
+        "--use_api_listing",
+        action="store_true",
+        help="Fetch the most recent submissions and their metadata with one arXiv API query instead of scraping the /new listing page.",
+    )
+    parser.add_argument(
+        "--papers_per_request",
+        type=int,
+        default=1,
+        help="Number of papers to summarize in a single LLM request (default: 1). Ignored with --use_batch.",
+    )
+    parser.add_argument(
+        "--stream_webhook",
+        action="store_true",
+        help="Send papers to the webhook in groups of --max_papers_split as soon as they are summarized, instead of after all papers (papers are not sorted by relevance). With --use_batch, papers are only ready once the whole batch completes.",
+    )
+
+    parser.add_argument(
+        "--skip_seen",
+        action="store_true",
+        help="Skip papers that were already sent to the webhook in earlier runs (tracked in the cache database).",
+    )
 
     args = parser.parse_args()
 
     try:
         summarizer = ArxivSummarizer()
-        summarizer.run(args.category, args.max_papers_split, args.user_interest, args.filter_level)
+        summarizer.run(
+            args.category,
+            args.max_papers_split,
+            args.user_interest,
+            args.filter_level,
+            args.use_batch,
+            args.use_api_listing,
+            args.papers_per_request,
+            args.stream_webhook,
+            args.skip_seen,
+        )
     except ValueError as e:
-        logging.critical(f"Configuration error: {e}. Please check your .env file.")
+        logging.critical("Configuration error: %s. Please check your .env file.", e)
     except Exception as e:
-        logging.critical(f"An unrecoverable error occurred during execution: {e}", exc_info=True)
+        logging.critical("An unrecoverable error occurred during execution: %s", e, exc_info=True)
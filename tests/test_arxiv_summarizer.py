@@ -0,0 +1,458 @@
+import asyncio
+import http.server
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+import requests
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import arxiv_summarizer  # noqa: E402
+from arxiv_summarizer import (  # noqa: E402
+    ArxivSummarizer,
+    PaperSummary,
+    RateLimitedAdapter,
+    RateLimitedRetry,
+    openai,
+)
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions, answering every request with a fixed reply."""
+
+    def __init__(self, content: str, failures: list[Exception] | None = None):
+        self.content = content
+        self.failures = failures or []
+        self.requests = []
+
+    async def create(self, **request):
+        self.requests.append(request)
+        if self.failures:
+            raise self.failures.pop(0)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class CompleteTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        os.environ.pop("OPENAI_BASE_URL", None)
+        self.summarizer = ArxivSummarizer()
+        self.completions = FakeCompletions("2")
+        self.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    async def test_memoizes_requests_with_integer_keys(self):
+        request = {
+            "model": "m",
+            "messages": [{"role": "user", "content": "x"}],
+            "temperature": 0.0,
+            "logit_bias": {15: 100, 16: 100, 17: 100},
+        }
+        self.assertEqual(await self.summarizer._complete(**request), "2")
+        self.assertEqual(await self.summarizer._complete(**request), "2")
+        self.assertEqual(len(self.completions.requests), 1)
+
+    async def test_relevance_request_reaches_the_api(self):
+        score = await self.summarizer.evaluate_relevance("Title", "Abstract", "speech")
+        self.assertEqual(score, 2)
+        self.assertEqual(len(self.completions.requests), 1)
+        self.assertIn("logit_bias", self.completions.requests[0])
+
+    @mock.patch("arxiv_summarizer.asyncio.sleep", new_callable=mock.AsyncMock)
+    async def test_relevance_request_is_retried_on_server_error(self, sleep):
+        error = openai.InternalServerError.__new__(openai.InternalServerError)
+        error.response = SimpleNamespace(headers={}, status_code=503)
+        self.completions.failures.append(error)
+        score = await self.summarizer.evaluate_relevance("Title", "Abstract", "speech")
+        self.assertEqual(score, 2)
+        self.assertEqual(len(self.completions.requests), 2)
+        sleep.assert_awaited_once()
+
+    async def test_relevance_errors_are_not_scored(self):
+        self.completions.failures.append(RuntimeError("boom"))
+        with self.assertRaises(RuntimeError):
+            await self.summarizer.evaluate_relevance("Title", "Abstract", "speech")
+
+
+class FakeBatchClient:
+    """Stands in for the files/batches endpoints; retrieve raises the queued failures first."""
+
+    def __init__(self, output: str, failures: list[Exception]):
+        self.output = output
+        self.failures = failures
+        self.files = SimpleNamespace(create=self.create_file, content=self.content)
+        self.batches = SimpleNamespace(create=self.create_batch, retrieve=self.retrieve)
+
+    async def create_file(self, **kwargs):
+        return SimpleNamespace(id="file-in")
+
+    async def create_batch(self, **kwargs):
+        return self.batch("in_progress", None)
+
+    async def retrieve(self, batch_id):
+        if self.failures:
+            raise self.failures.pop(0)
+        return self.batch("completed", "file-out")
+
+    async def content(self, file_id):
+        return SimpleNamespace(text=self.output)
+
+    @staticmethod
+    def batch(status, output_file_id):
+        return SimpleNamespace(
+            id="batch-1", status=status, output_file_id=output_file_id, error_file_id=None
+        )
+
+
+def connection_error() -> Exception:
+    return openai.APIConnectionError.__new__(openai.APIConnectionError)
+
+
+@mock.patch("arxiv_summarizer.asyncio.sleep", new_callable=mock.AsyncMock)
+class BatchTest(unittest.IsolatedAsyncioTestCase):
+    papers = {"1": {"title": "T", "abstract": "A"}}
+    output = orjson.dumps(
+        {
+            "custom_id": "1",
+            "response": {
+                "status_code": 200,
+                "body": {
+                    "choices": [
+                        {"message": {"content": '{"translated_title": "TT", "summary": "S"}'}}
+                    ]
+                },
+            },
+        }
+    ).decode()
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    async def test_poll_error_is_retried(self, sleep):
+        self.summarizer.client = FakeBatchClient(self.output, [connection_error()])
+        results = await self.summarizer.summarize_and_score_batch(self.papers)
+        self.assertEqual(results["1"].summary, "S")
+
+    async def test_giving_up_logs_the_batch_id(self, sleep):
+        failures = [connection_error() for _ in range(3)]
+        self.summarizer.client = FakeBatchClient(self.output, failures)
+        with self.assertLogs(level="ERROR") as logs:
+            results = await self.summarizer.summarize_and_score_batch(self.papers)
+        self.assertEqual(results, {})
+        self.assertIn("batch-1", "\n".join(logs.output))
+
+
+class PackedTest(unittest.IsolatedAsyncioTestCase):
+    paper_ids = ["1", "2", "3", "4"]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+        async def metadata(paper_id, prefetched=None):
+            return {"title": f"T{paper_id}", "abstract": f"A{paper_id}", "url": paper_id}
+
+        self.summarizer.get_paper_metadata = metadata
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    def run_for(self, on_paper=None):
+        return arxiv_summarizer.PipelineRun(None, "none", {}, on_paper, 4)
+
+    async def test_papers_are_streamed_as_their_chunk_completes(self):
+        streamed = []
+        first_chunk_streamed = asyncio.Event()
+
+        async def on_paper(metadata):
+            streamed.append(metadata["url"])
+            if len(streamed) == 2:
+                first_chunk_streamed.set()
+
+        async def packed(papers, user_interest=None):
+            if papers[0][0] == "T3":
+                # The second chunk only completes once the first one has been streamed
+                await first_chunk_streamed.wait()
+            return [PaperSummary(translated_title=t, summary="S") for t, _ in papers]
+
+        self.summarizer.summarize_and_score_packed = packed
+        papers = await asyncio.wait_for(
+            self.summarizer._process_packed(self.run_for(on_paper), self.paper_ids, 2), 5
+        )
+        self.assertEqual(streamed, self.paper_ids)
+        self.assertEqual([paper["url"] for paper in papers], self.paper_ids)
+
+    async def test_out_of_range_indexes_are_left_out(self):
+        entry = {"translated_title": "TT", "summary": "S"}
+        completions = FakeCompletions(
+            orjson.dumps({"papers": [{**entry, "index": 2}, {**entry, "index": 7}]}).decode()
+        )
+        self.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        results = await self.summarizer.summarize_and_score_packed([("T1", "A1"), ("T2", "A2")])
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1].translated_title, "TT")
+
+    async def test_left_out_papers_fall_back_to_single_requests(self):
+        async def packed(papers, user_interest=None):
+            return [PaperSummary(translated_title="TT", summary="S"), None]
+
+        self.summarizer.summarize_and_score_packed = packed
+        self.summarizer.summarize_and_score = mock.AsyncMock(
+            return_value=PaperSummary(translated_title="single", summary="S")
+        )
+        papers = await self.summarizer._process_packed(self.run_for(), ["1", "2"], 2)
+        self.summarizer.summarize_and_score.assert_awaited_once_with("T2", "A2", None)
+        self.assertEqual([paper["translated_title"] for paper in papers], ["TT", "single"])
+
+    async def test_entries_without_an_index_fall_back_to_single_requests(self):
+        completions = FakeCompletions(
+            orjson.dumps({"papers": [{"translated_title": "TT", "summary": "S"}]}).decode()
+        )
+        self.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        self.summarizer.summarize_and_score = mock.AsyncMock(
+            return_value=PaperSummary(translated_title="single", summary="S")
+        )
+        papers = await self.summarizer._process_packed(self.run_for(), ["1", "2"], 2)
+        self.assertEqual(self.summarizer.summarize_and_score.await_count, 2)
+        self.assertEqual([paper["url"] for paper in papers], ["1", "2"])
+
+
+class ParsingTest(unittest.TestCase):
+    feed = b"""<feed xmlns="http://www.w3.org/2005/Atom">
+      <entry>
+        <id>http://arxiv.org/api/errors#incorrect_id_format_for_1234</id>
+        <title>Error</title>
+        <summary>incorrect id format for 1234</summary>
+      </entry>
+      <entry>
+        <id>http://arxiv.org/abs/solv-int/9901001v2</id>
+        <title>A  title
+          over two lines</title>
+        <summary>Abstract</summary>
+        <author><name>Ada</name></author>
+      </entry>
+    </feed>"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_paper_id_handles_old_style_ids(self):
+        self.assertEqual(
+            ArxivSummarizer._paper_id("https://arxiv.org/abs/solv-int/9901001v2"),
+            "solv-int/9901001",
+        )
+        self.assertEqual(ArxivSummarizer._paper_id("/abs/2401.00001v1"), "2401.00001")
+
+    def test_atom_error_entry_is_skipped(self):
+        papers = self.summarizer._parse_atom_entries(self.feed)
+        self.assertEqual(list(papers), ["solv-int/9901001"])
+        self.assertEqual(papers["solv-int/9901001"]["title"], "A title over two lines")
+        self.assertEqual(
+            papers["solv-int/9901001"]["url"], "https://arxiv.org/abs/solv-int/9901001v2"
+        )
+
+
+class MetadataCacheTest(unittest.IsolatedAsyncioTestCase):
+    metadata = {"title": "T", "authors": "A", "abstract": "Abstract", "url": "https://x/abs/1"}
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    async def test_transient_tex_failure_is_not_cached(self):
+        with mock.patch.object(
+            self.summarizer.http, "get", side_effect=requests.exceptions.ConnectionError()
+        ) as get:
+            await self.summarizer.get_paper_metadata("1", dict(self.metadata))
+            await self.summarizer.get_paper_metadata("1", dict(self.metadata))
+        self.assertEqual(get.call_count, 2)
+        self.assertIsNone(self.summarizer._get_cached_metadata("1"))
+
+    async def test_missing_tex_source_is_cached(self):
+        response = requests.Response()
+        response.status_code = 404
+        with mock.patch.object(self.summarizer.http, "get", return_value=response):
+            await self.summarizer.get_paper_metadata("1", dict(self.metadata))
+        self.assertIsNone(self.summarizer._get_cached_metadata("1")["affiliations"])
+
+
+class SummaryCacheTest(unittest.TestCase):
+    metadata = {"title": "T", "abstract": "Abstract v1"}
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_revised_abstract_misses_the_cache(self):
+        result = PaperSummary(translated_title="TT", summary="S", relevance=1)
+        self.summarizer._cache_summary("1", self.metadata, "speech", result)
+        self.assertEqual(
+            self.summarizer._get_cached_summary("1", dict(self.metadata), "speech"), result
+        )
+        revised = {**self.metadata, "abstract": "Abstract v2"}
+        self.assertIsNone(self.summarizer._get_cached_summary("1", revised, "speech"))
+
+    def test_table_without_content_hash_is_replaced(self):
+        self.summarizer.cache.execute("DROP TABLE summaries")
+        self.summarizer.cache.execute("CREATE TABLE summaries (id TEXT, interest_hash TEXT)")
+        self.summarizer._setup_cache()
+        self.assertIsNone(self.summarizer._get_cached_summary("1", self.metadata, None))
+
+
+class SeenTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        self.summarizer = ArxivSummarizer()
+
+    def tearDown(self):
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_sent_papers_are_skipped_by_their_unversioned_id(self):
+        self.summarizer._mark_seen(
+            [
+                {"url": "https://arxiv.org/abs/2401.00001v2"},
+                {"url": "https://arxiv.org/abs/solv-int/9901001v1"},
+            ]
+        )
+        self.assertEqual(
+            self.summarizer._drop_seen(["2401.00001", "2401.00002", "solv-int/9901001"]),
+            ["2401.00002"],
+        )
+
+
+class FlakyHandler(http.server.BaseHTTPRequestHandler):
+    """Answers 503 to every request but the last of each group of three, recording times."""
+
+    times = []
+
+    def do_GET(self):
+        self.times.append(time.monotonic())
+        self.send_response(200 if len(self.times) % 3 == 0 else 503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class RateLimitedAdapterTest(unittest.TestCase):
+    def test_retries_wait_for_a_slot(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        session = requests.Session()
+        # No backoff of its own, so any spacing between attempts comes from the limiter
+        retry = RateLimitedRetry(total=3, backoff_factor=0, status_forcelist=[503])
+        session.mount("http://", RateLimitedAdapter(0.2, max_retries=retry))
+        FlakyHandler.times = []
+        response = session.get(f"http://127.0.0.1:{server.server_port}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(FlakyHandler.times), 3)
+        gaps = [b - a for a, b in zip(FlakyHandler.times, FlakyHandler.times[1:])]
+        self.assertTrue(all(gap >= 0.19 for gap in gaps), gaps)
+
+
+class WebhookHandler(http.server.BaseHTTPRequestHandler):
+    """Answers POSTs with the queued status codes (then 200), recording the request headers."""
+
+    statuses = []
+    requests = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.requests.append(dict(self.headers))
+        self.send_response(self.statuses.pop(0) if self.statuses else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class WebhookTest(unittest.TestCase):
+    papers = [{"title": "T", "translated_title": "TT", "authors": "A", "url": "u", "summary": "S"}]
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CACHE_PATH"] = os.path.join(self.tmpdir.name, "cache.db")
+        os.environ["WEBHOOK_URL"] = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.summarizer = ArxivSummarizer()
+        WebhookHandler.statuses = []
+        WebhookHandler.requests = []
+
+    def tearDown(self):
+        del os.environ["WEBHOOK_URL"]
+        self.summarizer.cache.close()
+        self.tmpdir.cleanup()
+        self.server.shutdown()
+
+    def test_post_is_retried_on_503(self):
+        WebhookHandler.statuses = [503]
+        self.assertIsNotNone(self.summarizer.send_arxiv_data_via_webhook(self.papers, "cs"))
+        self.assertEqual(len(WebhookHandler.requests), 2)
+
+    def test_gzip_falls_back_to_plain_bodies_on_415(self):
+        self.summarizer.webhook_gzip = True
+        WebhookHandler.statuses = [415]
+        self.assertIsNotNone(self.summarizer.send_arxiv_data_via_webhook(self.papers, "cs"))
+        self.assertEqual(len(WebhookHandler.requests), 2)
+        self.assertEqual(WebhookHandler.requests[0].get("Content-Encoding"), "gzip")
+        self.assertNotIn("Content-Encoding", WebhookHandler.requests[1])
+        self.assertFalse(self.summarizer.webhook_gzip)
+
+    def test_post_is_not_retried_on_500(self):
+        WebhookHandler.statuses = [500]
+        self.assertIsNone(self.summarizer.send_arxiv_data_via_webhook(self.papers, "cs"))
+        self.assertEqual(len(WebhookHandler.requests), 1)
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_returns_an_already_imported_module(self):
+        self.assertIs(arxiv_summarizer._lazy_import("unittest"), unittest)
+
+    def test_missing_module_raises(self):
+        with self.assertRaises(ModuleNotFoundError):
+            arxiv_summarizer._lazy_import("no_such_module_for_arxiv_summarizer")
+
+
+if __name__ == "__main__":
+    unittest.main()